@@ -1,3 +1,15 @@
 """Python utilities for working with Stormgate replays"""
 
-__version__ = "0.2.7"
+from importlib import import_module
+
+from shroudstone._version import __version__
+
+_lazy_submodules = {"cli", "config", "gui", "renamer", "replay"}
+
+
+def __getattr__(name: str):
+    # Submodules are only imported when first accessed, so that `import
+    # shroudstone` stays cheap and never drags in the GUI or CLI stacks.
+    if name in _lazy_submodules:
+        return import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
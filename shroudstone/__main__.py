@@ -3,10 +3,19 @@
 By default, launches the GUI; unless any CLI arguments are provided, in which case we fall back to CLI."""
 
 import sys
+from multiprocessing import freeze_support
 
 
 def main():
-    if len(sys.argv) > 1:
+    # Replay parsing may use a process pool, whose workers need this to start
+    # up properly in a pyinstaller build:
+    freeze_support()
+    if sys.argv[1:] in (["--version"], ["-V"]):
+        # Fast path: don't pay for importing typer & friends just to print this.
+        from shroudstone._version import __version__
+
+        print(f"Shroudstone v{__version__}")
+    elif len(sys.argv) > 1:
         import shroudstone.cli
 
         shroudstone.cli.app()
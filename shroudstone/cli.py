@@ -3,25 +3,17 @@
 To get started renaming your replays, use [b]rename-replays --help[/b] to view
 options or [b]rename-replays[/b] to jump straight in."""
 
+import gc
 import logging
 import os
-import platform
-import subprocess
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Annotated, Optional
 
 import typer
-from typing_extensions import Annotated
 
-from shroudstone import __version__
-from shroudstone.config import (
-    DEFAULT_GENERIC_FORMAT,
-    Config,
-    DEFAULT_1v1_FORMAT,
-    config_file,
-)
-from shroudstone.logging import configure_logging
+if TYPE_CHECKING:
+    from shroudstone.config import Config
 
 app = typer.Typer(rich_markup_mode="rich", help=sys.modules[__name__].__doc__)
 
@@ -30,6 +22,8 @@ logger = logging.getLogger(__name__)
 
 def version(value: bool):
     if value:
+        from shroudstone import __version__
+
         typer.echo(f"Shroudstone v{__version__}")
         raise typer.Exit()
 
@@ -41,13 +35,19 @@ def callback(
         bool,
         typer.Option(
             "--version",
+            "-V",
             help="Show version information for your shroudstone installation",
             callback=version,
         ),
     ] = False,
     debug: bool = False,
 ):
+    from shroudstone.logging import configure_logging
+
     configure_logging(debug=debug)
+    # Everything imported so far lives for the rest of the process; move it
+    # out of the way of the garbage collector before the real work starts.
+    gc.freeze()
 
 
 @app.command(rich_help_panel="Tools for nerds")
@@ -59,17 +59,45 @@ def get_replay_info(replay_file: typer.FileBinaryRead):
 
 
 @app.command(rich_help_panel="Tools for nerds")
-def split_replay(replay_file: typer.FileBinaryRead, output_directory: Path):
+def split_replay(
+    replay_file: typer.FileBinaryRead,
+    output_directory: Path,
+    concatenated: Annotated[
+        bool,
+        typer.Option(
+            "--concatenated/--separate",
+            help="Write a single length-prefixed replay.pbl stream instead of one file per message",
+        ),
+    ] = False,
+):
     """Extract a stormgate replay into a directory containing individual protoscope messages."""
-    from shroudstone.replay.parser import split_replay
+    from shroudstone.replay.parser import encode_varint, split_replay
 
     output_directory.mkdir(exist_ok=True, parents=True)
-    i = 0
-    for i, chunk in enumerate(split_replay(replay_file)):
-        (output_directory / f"{i:07d}.binpb").write_bytes(chunk)
-    typer.echo(
-        f"Wrote {i+1} replay messages in protoscope wire format to {output_directory}/."
-    )
+    i = -1
+    if concatenated:
+        output_file = output_directory / "replay.pbl"
+        with open(output_file, "wb", buffering=1 << 20) as f:
+            for i, chunk in enumerate(split_replay(replay_file)):
+                f.write(encode_varint(len(chunk)))
+                f.write(chunk)
+        typer.echo(
+            f"Wrote {i+1} length-prefixed replay messages in protoscope wire format to {output_file}."
+        )
+    else:
+        # Replays contain thousands of tiny messages, so skip pathlib and
+        # buffered IO and go straight to the OS for each file:
+        dir_str = os.fspath(output_directory)
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+        for i, chunk in enumerate(split_replay(replay_file)):
+            fd = os.open(os.path.join(dir_str, f"{i:07d}.binpb"), flags, 0o644)
+            try:
+                os.write(fd, chunk)
+            finally:
+                os.close(fd)
+        typer.echo(
+            f"Wrote {i+1} replay messages in protoscope wire format to {output_directory}/."
+        )
 
 
 @app.command(rich_help_panel="Tools for nerds")
@@ -86,28 +114,39 @@ def dump_replay(replay_file: typer.FileBinaryRead):
 @app.command(rich_help_panel="Tools for nerds")
 def config_path():
     """Print the real path to the shroudstone configuration file."""
-    if not config_file.exists():
+    from shroudstone.config import Config, resolved_config_file
+
+    try:
+        path = resolved_config_file()
+    except FileNotFoundError:
         Config().save()
-    typer.echo(config_file.resolve())
+        path = resolved_config_file()
+    typer.echo(path)
 
 
 @app.command(rich_help_panel="Tools for nerds")
 def edit_config(xdg_open: bool = False):
     """Open the shroudstone configuration file in your default text editor."""
-    from shroudstone import renamer
+    from shroudstone.config import Config, resolved_config_file
+
+    try:
+        realpath = resolved_config_file()
+    except FileNotFoundError:
+        from shroudstone import renamer
 
-    if not config_file.exists():
         logger.info("No config file found, doing our best to auto-generate one.")
         cfg = Config()
         # Prefill this path if possible:
         cfg.replay_dir = renamer.guess_replay_dir()
         cfg.save()
+        realpath = resolved_config_file()
 
-    realpath = config_file.resolve()
-    if platform.system() == "Windows":
-        # .resolve() is crucial when python is installed from the microsoft store
-        subprocess.run(["cmd", "/c", f"start {realpath}"])
+    if sys.platform == "win32":
+        # Resolving is crucial when python is installed from the microsoft store
+        os.startfile(realpath)
     else:
+        import subprocess
+
         if xdg_open:
             editor = "xdg-open"
         else:
@@ -131,13 +170,15 @@ def rename_replays(
     format_1v1: Annotated[
         Optional[str],
         typer.Option(
-            help=f"Format string for 1v1 replays \n(e.g. '{DEFAULT_1v1_FORMAT}')"
+            # Duplicated from config.DEFAULT_1v1_FORMAT to avoid importing it for --help
+            help="Format string for 1v1 replays \n(e.g. '{time:%Y-%m-%d %H.%M} {result:.1} {duration} {us} {f1:.1}v{f2:.1} {them} - {map_name}.SGReplay')"
         ),
     ] = None,
     format_generic: Annotated[
         Optional[str],
         typer.Option(
-            help=f"Format string for other replays \n(e.g. '{DEFAULT_GENERIC_FORMAT}')"
+            # Duplicated from config.DEFAULT_GENERIC_FORMAT to avoid importing it for --help
+            help="Format string for other replays \n(e.g. '{time:%Y-%m-%d %H.%M} {duration} {players_with_factions} - {map_name}.SGReplay')"
         ),
     ] = None,
     backup: bool = True,
@@ -169,6 +210,7 @@ def rename_replays(
     * build_number (int): Build number of Stormgate version on which the game was played (extracted from replay file)
     """
     from shroudstone import renamer
+    from shroudstone.config import Config
 
     config = Config.load()
     if replay_dir is None:
@@ -183,7 +225,7 @@ def rename_replays(
     )
 
 
-def get_replay_dir(config: Config) -> Path:
+def get_replay_dir(config: "Config") -> Path:
     from shroudstone.renamer import guess_replay_dir
 
     if config.replay_dir is None:
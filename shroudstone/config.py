@@ -1,16 +1,24 @@
 """Persistent configuration stored in standard user data directories"""
 
 import os
-import platform
+import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 import yaml
 from pydantic import BaseModel, ConfigDict
 
+try:
+    # Use the libyaml bindings when available, they're much faster:
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeDumper, SafeLoader  # type: ignore
+
 
 def _platform_data_dir() -> Path:
-    if platform.system() == "Windows":
+    if sys.platform == "win32":
         return Path(os.environ["LOCALAPPDATA"])
     else:
         xdg_data_home = os.environ.get("XDG_DATA_HOME")
@@ -20,9 +28,26 @@ def _platform_data_dir() -> Path:
 
 
 data_dir = _platform_data_dir() / "shroudstone"
-data_dir.mkdir(parents=True, exist_ok=True)
 config_file = data_dir / "config.yaml"
 
+
+def ensure_data_dir():
+    """Create the data directory if needed. Call this before writing into it."""
+    if not data_dir.exists():
+        data_dir.mkdir(parents=True, exist_ok=True)
+
+
+@lru_cache(maxsize=1)
+def resolved_config_file() -> Path:
+    """The real path to the config file, resolved once per process.
+
+    Raises FileNotFoundError if the config file doesn't exist yet: when python
+    is installed from the microsoft store, the resolved path can differ from
+    the real location of a file that has not yet been created, so we must not
+    cache it."""
+    return config_file.resolve(strict=True)
+
+
 DEFAULT_1v1_FORMAT = "{time:%Y-%m-%d %H.%M} {result:.1} {duration} {us} {f1:.1}v{f2:.1} {them} - {map_name}.SGReplay"
 DEFAULT_GENERIC_FORMAT = (
     "{time:%Y-%m-%d %H.%M} {duration} {players_with_factions} - {map_name}.SGReplay"
@@ -39,20 +64,43 @@ class Config(BaseModel):
 
     @staticmethod
     def load():
-        if config_file.exists():
-            with config_file.open("rt", encoding="utf-8") as f:
-                content = yaml.load(f, Loader=yaml.SafeLoader)
-                # Migrate old configs:
-                if "replay_name_format" in content:
-                    content["replay_name_format_1v1"] = content["replay_name_format"]
-                return Config.model_validate(content)
-        else:
+        global _cache
+        try:
+            key = _cache_key()
+        except FileNotFoundError:
             config = Config()
             config.save()
             return config
+        if _cache is not None and _cache[0] == key:
+            # Callers are free to mutate the config they get back:
+            return _cache[1].model_copy(deep=True)
+        # The file is tiny, so slurp it in one read and parse from memory:
+        content = yaml.load(config_file.read_bytes(), Loader=SafeLoader)
+        # Migrate old configs:
+        if "replay_name_format" in content:
+            content["replay_name_format_1v1"] = content["replay_name_format"]
+        config = Config.model_validate(content)
+        _cache = (key, config.model_copy(deep=True))
+        return config
 
     def save(self):
-        with config_file.open("wt", encoding="utf-8") as f:
-            yaml.dump(self.model_dump(mode="json"), f, width=float("inf"))
+        global _cache
+        ensure_data_dir()
+        # libyaml needs an integer width, so use the largest it accepts to
+        # avoid wrapping long format strings:
+        content = yaml.dump(
+            self.model_dump(mode="json"), Dumper=SafeDumper, width=2**31 - 1
+        )
+        config_file.write_bytes(content.encode("utf-8"))
+        _cache = (_cache_key(), self.model_copy(deep=True))
 
     model_config = ConfigDict(extra="ignore")
+
+
+_cache: Optional[Tuple[Tuple[int, int], Config]] = None
+"""The most recently loaded/saved config, keyed by the file's (mtime, size)."""
+
+
+def _cache_key() -> Tuple[int, int]:
+    st = config_file.stat()
+    return (st.st_mtime_ns, st.st_size)
@@ -1,67 +1,201 @@
-import dataclasses
 import logging
-import platform
+import sys
 import tkinter as tk
-from functools import partial
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
+from queue import Empty, SimpleQueue
 from threading import Event, Thread, get_ident
 from tkinter import ttk
 from tkinter.filedialog import askdirectory
-from tkinter.messagebox import askyesno, showinfo, showwarning
-from typing import Optional
-
-from PIL import Image
-from pystray import Icon, Menu, MenuItem
-from pystray._base import Icon as BaseIcon
+from tkinter.messagebox import showinfo, showwarning
+from typing import TYPE_CHECKING, Callable, List, Literal, Optional
 
 from shroudstone import __version__, config, renamer
 from shroudstone.gui.fonts import setup_style
-from shroudstone.gui.logview import LogView
 from shroudstone.logging import configure_logging
 
+from .dialogs import ConfirmDialog
 from .jobs import TkWithJobs
+from .watcher import REPLAY_ADDED, ReplayWatcher
+
+if TYPE_CHECKING:
+    from PIL.Image import Image
+    from pystray._base import Icon as BaseIcon
+
+    from shroudstone.gui.logview import LogView
 
 logger = logging.getLogger(__name__)
 assets_dir = Path(__file__).parent / "assets"
+icon_png = assets_dir / "shroudstone.png"
+icon_ico = assets_dir / "shroudstone.ico"
 
+TRAY_POLL_INTERVAL = 100
+"""How often (in ms) the main loop checks for actions from the tray icon thread."""
 
-class StringVar(tk.StringVar):
-    def on_change(self, func):
-        self.trace_add("write", func)
+
+@lru_cache(maxsize=1)
+def _tray_image() -> "Image":
+    """The tray icon image, fully decoded so the file isn't held open."""
+    from PIL import Image
+
+    image = Image.open(icon_png)
+    image.load()
+    return image
+
+
+@lru_cache(maxsize=1)
+def _path(s: str) -> Path:
+    """Path(s), reusing the last result - the replay dir is converted to a Path
+    by several handlers every time it changes."""
+    return Path(s)
+
+
+def _is_dir(path: Path) -> bool:
+    """path.is_dir(), but False if we can't tell (e.g. permission denied, or
+    an unreachable network share) rather than raising."""
+    try:
+        return path.is_dir()
+    except OSError:
+        return False
+
+
+FormatType = Literal["1v1", "generic"]
 
 
-class BoolVar(tk.BooleanVar):
+@lru_cache(maxsize=128)
+def _format_error(fstr: str, type: FormatType) -> Optional[str]:
+    """Validate a replay name format string, returning an error message if
+    it's invalid or None if it's fine."""
+    try:
+        renamer.validate_format_string(fstr, type=type)
+    except ValueError as e:
+        return str(e)
+    return None
+
+
+def configure_changed(widget: tk.Misc, **options):
+    """widget.configure(**options), but skipping any options that already have
+    the given values. Only works if all changes to these options go through
+    this function!"""
+    current = widget.__dict__.setdefault("_configured_options", {})
+    changed = {k: v for k, v in options.items() if current.get(k) != v}
+    if changed:
+        widget.configure(**changed)  # type: ignore
+        current.update(changed)
+
+
+class ObservableVar(tk.Variable):
+    """Mixin for Tk variables allowing change callbacks to be registered and
+    temporarily suspended.
+
+    However many callbacks are registered, there's only a single Tcl trace on
+    the variable, which dispatches to them in Python."""
+
+    _callbacks: List[Callable[..., object]]
+    _suspended: bool = False
+
     def on_change(self, func):
-        self.trace_add("write", func)
+        if not hasattr(self, "_callbacks"):
+            self._callbacks = []
+            self.trace_add("write", self._dispatch)
+        self._callbacks.append(func)
+        return func
+
+    def remove_change(self, func):
+        """Unregister a callback previously passed to on_change."""
+        self._callbacks.remove(func)
+
+    def set(self, value):
+        # Tk fires write traces even if the value is unchanged, so skip those:
+        try:
+            unchanged = self.get() == value
+        except (tk.TclError, ValueError):
+            unchanged = False
+        if not unchanged:
+            super().set(value)
+
+    def _dispatch(self, *args):
+        if not self._suspended:
+            # (Copy, in case a callback is removed from another thread meanwhile)
+            for func in tuple(self._callbacks):
+                func(*args)
+
+    def fire_change(self):
+        """Run the change callbacks, as if the variable had just been written."""
+        for func in getattr(self, "_callbacks", []):
+            func(str(self), "", "write")
+
+
+class StringVar(ObservableVar, tk.StringVar):
+    pass
 
 
-def field(factory, **kw):
-    return dataclasses.field(default_factory=partial(factory, **kw))
+class BoolVar(ObservableVar, tk.BooleanVar):
+    pass
 
 
-@dataclasses.dataclass
 class AppState:
-    replay_dir: StringVar = field(StringVar)
-    replay_name_format_1v1: StringVar = field(StringVar)
-    replay_name_format_generic: StringVar = field(StringVar)
-    reprocess: BoolVar = field(BoolVar)
-    dry_run: BoolVar = field(BoolVar)
-    autorename: BoolVar = field(BoolVar)
-    minimize_to_tray: BoolVar = field(BoolVar)
-    show_log_on_autorename: BoolVar = field(BoolVar)
+    replay_dir: StringVar
+    replay_name_format_1v1: StringVar
+    replay_name_format_generic: StringVar
+    reprocess: BoolVar
+    dry_run: BoolVar
+    autorename: BoolVar
+    minimize_to_tray: BoolVar
+    show_log_on_autorename: BoolVar
+
+    def __init__(self):
+        self.replay_dir = StringVar()
+        self.replay_name_format_1v1 = StringVar()
+        self.replay_name_format_generic = StringVar()
+        self.reprocess = BoolVar()
+        self.dry_run = BoolVar()
+        self.autorename = BoolVar()
+        self.minimize_to_tray = BoolVar()
+        self.show_log_on_autorename = BoolVar()
+
+    @contextmanager
+    def batch(self):
+        """Set a bunch of variables at once: each variable's change callbacks
+        run at most once at the end of the block, and not at all if its value
+        didn't actually change."""
+        variables = [v for v in vars(self).values() if isinstance(v, ObservableVar)]
+        before = [v.get() for v in variables]
+        for v in variables:
+            v._suspended = True
+        try:
+            yield
+        finally:
+            for v, old in zip(variables, before):
+                v._suspended = False
+                if v.get() != old:
+                    v.fire_change()
 
 
 class App(TkWithJobs):
-    systray_icon: Optional[BaseIcon] = None
+    systray_icon: Optional["BaseIcon"] = None
     systray_thread: Optional[Thread] = None
-    tray_quit_event: Event
+    tray_actions: "SimpleQueue[Callable[[], object]]"
+    _tray_poll_id: Optional[str] = None
+    autorename_enabled: bool = False
+    """Mirror of vars.autorename, for the tray icon thread to read."""
+    log_view: Optional["LogView"] = None
+    window_icon: Optional[tk.PhotoImage] = None
+    exit_dialog: Optional[ConfirmDialog] = None
     vars: AppState
+    replay_watcher: ReplayWatcher
 
     def quit_app(self):
         logger.debug(f"Running quit_app in {get_ident()}")
+        self.jobs.destroy()
+        self.replay_watcher.stop()
+        if self._tray_poll_id is not None:
+            self.after_cancel(self._tray_poll_id)
         if self.systray_thread:
             logger.debug("Joining tray icon thread")
-            self.systray_thread.join()
+            self.systray_thread.join(timeout=1.0)
         logger.debug("Destroying main Tk app")
         self.destroy()
 
@@ -72,46 +206,93 @@ class App(TkWithJobs):
             self.request_exit()
 
     def request_exit(self):
-        if (not self.vars.autorename.get()) or askyesno(
+        if not self.vars.autorename.get():
+            self.exit_app()
+            return
+        if self.exit_dialog is not None:
+            self.exit_dialog.lift()
+            return
+        # Don't use askyesno here: it would block the main loop (and hence
+        # any autorenaming) until answered.
+        dialog = self.exit_dialog = ConfirmDialog(
+            self,
             title="Shroudstone - Exit?",
             message="You have autorenaming enabled, which will stop functioning if you exit the program.\n"
             "Consider enabling 'Minimize to tray' if you want to keep auto-renaming without this window open.\n\n"
             "Are you sure you want to exit?\n",
-        ):
-            # Ask the tray icon to quit
-            if self.systray_icon is not None:
-                self.systray_icon.stop()
-                # When it's done cleaning up, tray_quit_event will be set,
-                # so no further action required
-            else:
-                self.quit_app()
+        )
 
-    def setup_tray_icon(self):
-        self.systray_thread = Thread(target=self._tray_icon_thread)
-        self.systray_thread.start()
+        def on_answer(result: "Future[bool]"):
+            self.exit_dialog = None
+            if result.result():
+                self.exit_app()
 
-    def _tray_icon_thread(self):
-        state = self.vars
+        dialog.result.add_done_callback(on_answer)
 
-        def toggle_autorename():
-            state.autorename.set(not state.autorename.get())
+    def exit_app(self):
+        # Ask the tray icon to quit
+        if self.systray_icon is not None:
+            self.systray_icon.stop()
+            # When it's done cleaning up, it'll queue up quit_app, so no
+            # further action required
+        else:
+            self.quit_app()
 
-        def show():
-            self.deiconify()
-            self.wm_state("normal")
-            self.tkraise()
+    def show_window(self):
+        self.deiconify()
+        self.wm_state("normal")
+        self.tkraise()
 
-        def hide():
-            self.withdraw()
+    def toggle_autorename(self):
+        self.vars.autorename.set(not self.vars.autorename.get())
 
-        image = Image.open(assets_dir / "shroudstone.png")
+    def _on_autorename_change(self, *_):
+        self.autorename_enabled = self.vars.autorename.get()
+        if self.systray_icon is not None:
+            self.systray_icon.update_menu()
+
+    def setup_tray_icon(self):
+        if self.systray_thread is not None and self.systray_thread.is_alive():
+            return
+        # Daemonized so that a stuck tray icon can't stop the process exiting
+        self.systray_thread = Thread(
+            target=self._tray_icon_thread, name="ShroudstoneTray", daemon=True
+        )
+        self.systray_thread.start()
+        self._tray_poll_id = self.after(TRAY_POLL_INTERVAL, self._poll_tray_actions)
+
+    def _poll_tray_actions(self):
+        assert self.systray_thread is not None
+        # Check this before draining the queue: once the thread's finished, it
+        # can't queue any more. (And reschedule before running anything, in
+        # case it's quit_app, which cancels this.)
+        self._tray_poll_id = None
+        if self.systray_thread.is_alive():
+            self._tray_poll_id = self.after(
+                TRAY_POLL_INTERVAL, self._poll_tray_actions
+            )
+        while True:
+            try:
+                action = self.tray_actions.get_nowait()
+            except Empty:
+                break
+            action()
+
+    def _tray_icon_thread(self):
+        # These are slow to import, so keep them off the main thread:
+        from pystray import Icon, Menu, MenuItem
+
+        # We're not in the Tk thread here, so we mustn't touch Tk at all (not
+        # even its variables): we just queue up actions for the main loop.
+        actions = self.tray_actions
+        image = _tray_image()
         menu = Menu(
-            MenuItem("Show", show, default=True),
-            MenuItem("Minimize to tray", hide),
+            MenuItem("Show", lambda: actions.put(self.show_window), default=True),
+            MenuItem("Minimize to tray", lambda: actions.put(self.withdraw)),
             MenuItem(
                 "Auto-renaming",
-                toggle_autorename,
-                checked=lambda item: state.autorename.get(),
+                lambda: actions.put(self.toggle_autorename),
+                checked=lambda item: self.autorename_enabled,
             ),
             MenuItem("Quit", lambda: icon.stop()),
         )
@@ -122,36 +303,35 @@ class App(TkWithJobs):
             menu=menu,
         )
 
-        @state.autorename.on_change
-        def _(*_):
-            icon.update_menu()
-
         logger.debug(f"icon.run() in thread {get_ident()}")
         icon.run()
         logger.debug("icon.run done")
-        self.tray_quit_event.set()
+        actions.put(self.quit_app)
+
+    def get_log_view(self) -> "LogView":
+        """Get the log window, creating it (hidden) if it doesn't exist yet."""
+        log_view = self.log_view
+        if log_view is None:
+            from shroudstone.gui.logview import LogView
+
+            log_view = self.log_view = LogView(self)
+            log_view.withdraw()
+            log_view.protocol("WM_DELETE_WINDOW", log_view.clear_and_close)
+        return log_view
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.vars = AppState()
+        self.replay_watcher = ReplayWatcher(self)
         self.protocol("WM_DELETE_WINDOW", self.on_window_close)
+        self.tray_actions = SimpleQueue()
+        self.vars.autorename.on_change(self._on_autorename_change)
         logger.debug(f"Main thread is {get_ident()}")
 
         self.after(0, self.custom_startup)
 
     def custom_startup(self):
         """This method performs custom startup actions *after* the mainloop has started."""
-
-        # The systray icon passes this message back from its thread when it's done:
-        self.tray_quit_event = Event()
-
-        def _check_quit_event():
-            if self.tray_quit_event.is_set():
-                self.quit_app()
-            self.after(10, _check_quit_event)
-
-        _check_quit_event()
-
         self.setup_tray_icon()
 
 
@@ -160,32 +340,43 @@ class App(TkWithJobs):
 # custom_startup method, so it's a bit of a mess. Definitely some kind of
 # tidyup needs to be done.
 def run():
-    configure_logging()
-    renamer.migrate()
-    logger.info(
-        "Keep this console open - it will show progress information during renaming."
-    )
-    cfg: config.Config = config.Config.load()
-
-    root = App(className="Shroudstone")
-    setup_style(root)
-    setup_window_icon(root)
+    # Read the config while Tk is starting up; they don't depend on each other:
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        cfg_future = pool.submit(config.Config.load)
+        root = App(className="Shroudstone")
+        setup_style(root)
+        setup_window_icon(root)
+        cfg: config.Config = cfg_future.result()
 
     if cfg.replay_dir is None:
         root.after(0, lambda: configure_replay_dir(root, root.vars, cfg))
 
     create_main_ui(root, cfg)
+    # None of this is needed to draw the window, so get that on screen first:
+    root.after_idle(lambda: deferred_startup(root))
     root.mainloop()
 
 
-def setup_window_icon(root: tk.Tk):
-    if platform.system() == "Windows":
+def deferred_startup(root: TkWithJobs):
+    configure_logging()
+    # This touches the disk, so keep it off the Tk thread. (There's no need to
+    # wait for it before renaming: renamer.rename_replays migrates first too.)
+    root.jobs.submit(renamer.migrate, lambda _: None)
+    logger.info(
+        "Keep this console open - it will show progress information during renaming."
+    )
+
+
+def setup_window_icon(root: App):
+    if sys.platform == "win32":
         # TODO: This .ico currently only has a 64x64px image in it, which looks
         # garbage when resized down to fit in window titlebars etc.
-        window_icon = assets_dir / "shroudstone.ico"
-        root.iconbitmap(str(window_icon))
+        root.iconbitmap(str(icon_ico))
     else:
-        root.iconphoto(True, tk.PhotoImage(file=str(assets_dir / "shroudstone.png")))
+        if root.window_icon is None:
+            # Keep a reference, so the image isn't garbage collected while in use
+            root.window_icon = tk.PhotoImage(master=root, file=str(icon_png))
+        root.iconphoto(True, root.window_icon)
 
 
 def configure_replay_dir(root: TkWithJobs, state: AppState, cfg: config.Config):
@@ -225,11 +416,12 @@ def create_main_ui(root: App, cfg: config.Config):
     def reload_config():
         nonlocal cfg
         cfg = config.Config.load()
-        state.replay_dir.set(str(cfg.replay_dir or ""))
-        state.replay_name_format_1v1.set(cfg.replay_name_format_1v1)
-        state.replay_name_format_generic.set(cfg.replay_name_format_generic)
-        state.minimize_to_tray.set(cfg.minimize_to_tray)
-        state.show_log_on_autorename.set(cfg.show_log_on_autorename)
+        with state.batch():
+            state.replay_dir.set(str(cfg.replay_dir or ""))
+            state.replay_name_format_1v1.set(cfg.replay_name_format_1v1)
+            state.replay_name_format_generic.set(cfg.replay_name_format_generic)
+            state.minimize_to_tray.set(cfg.minimize_to_tray)
+            state.show_log_on_autorename.set(cfg.show_log_on_autorename)
 
     def save_config():
         cfg.save()
@@ -259,7 +451,7 @@ def create_main_ui(root: App, cfg: config.Config):
     replay_dir_error.grid(row=1, column=1, sticky="WE", ipadx=5, ipady=5)
 
     def browse_replay_dir():
-        current = Path(state.replay_dir.get())
+        current = _path(state.replay_dir.get())
         initial = current if current.exists() else None
         new = askdirectory(
             title="Stormgate Replay Directory", initialdir=initial, mustexist=True
@@ -275,54 +467,75 @@ def create_main_ui(root: App, cfg: config.Config):
         side="left", fill="y", padx=2, ipadx=2, ipady=2
     )
 
-    ttk.Button(replay_dir_row, text="Autodetect", command=guess_replay_dir).pack(
-        side="left", fill="y", padx=2, ipadx=2, ipady=2
+    autodetect_button = ttk.Button(
+        replay_dir_row, text="Autodetect", command=guess_replay_dir
+    )
+    autodetect_button.pack(side="left", fill="y", padx=2, ipadx=2, ipady=2)
+    # The autodetected directory is cached; Shift-click to force a rescan.
+    # (This fires on press, so the cache is cleared before the click's command runs.)
+    autodetect_button.bind(
+        "<Shift-ButtonPress-1>", lambda _: renamer.guess_replay_dir.cache_clear()
     )
 
-    @state.replay_dir.on_change
-    def _(*_):
-        path = Path(state.replay_dir.get())
-        if path.is_dir():
-            replay_dir_error.configure(text="Looks good!", background="#66ff66")
-            cfg.replay_dir = path
-            save_config_button.configure(state="normal")
-            rename_button.configure(state="normal")
-        else:
-            replay_dir_error.configure(
-                text="Directory does not exist!", background="#ff6666"
-            )
-            save_config_button.configure(state="disabled")
-            rename_button.configure(state="disabled")
+    def set_buttons(enabled: bool):
+        """Enable/disable the buttons that need a valid config to work."""
+        button_state = "normal" if enabled else "disabled"
+        for button in (save_config_button, rename_button):
+            configure_changed(button, state=button_state)
+
+    # Validation hits the filesystem/parses format strings, so don't do it on
+    # every keystroke:
+    # (This is the replay dir whose status is currently displayed.)
+    checked_replay_dir: Optional[str] = None
+
+    @root.debounce(200)
+    def check_replay_dir():
+        text = state.replay_dir.get()
+        if text == checked_replay_dir:
+            return
+        path = _path(text)
+
+        def callback(is_dir: bool):
+            nonlocal checked_replay_dir
+            if state.replay_dir.get() != text:
+                return  # Stale result, there's a newer check on the way
+            checked_replay_dir = text
+            if is_dir:
+                configure_changed(
+                    replay_dir_error, text="Looks good!", style="OK.TLabel"
+                )
+                set_buttons(True)
+            else:
+                configure_changed(
+                    replay_dir_error,
+                    text="Directory does not exist!",
+                    style="Err.TLabel",
+                )
+                set_buttons(False)
 
-    @state.replay_name_format_1v1.on_change
-    def _(*_):
-        fstr = state.replay_name_format_1v1.get()
-        try:
-            renamer.validate_format_string(fstr, type="1v1")
-        except ValueError as e:
-            format_error_1v1.configure(text=f"Error: {e}", background="#ff6666")
-            save_config_button.configure(state="disabled")
-            rename_button.configure(state="disabled")
-        else:
-            format_error_1v1.configure(text="Looks good!", background="#66ff66")
-            cfg.replay_name_format_1v1 = fstr
-            save_config_button.configure(state="normal")
-            rename_button.configure(state="normal")
+        # is_dir can block for a long time on network drives, so do it in a thread:
+        root.jobs.submit(_is_dir, callback, path)
 
-    @state.replay_name_format_generic.on_change
+    @state.replay_dir.on_change
     def _(*_):
-        fstr = state.replay_name_format_generic.get()
-        try:
-            renamer.validate_format_string(fstr, type="generic")
-        except ValueError as e:
-            format_error_generic.configure(text=f"Error: {e}", background="#ff6666")
-            save_config_button.configure(state="disabled")
-            rename_button.configure(state="disabled")
-        else:
-            format_error_generic.configure(text="Looks good!", background="#66ff66")
-            cfg.replay_name_format_generic = fstr
-            save_config_button.configure(state="normal")
-            rename_button.configure(state="normal")
+        cfg.replay_dir = _path(state.replay_dir.get())
+        check_replay_dir()
+
+    def wire_format(var: StringVar, type: FormatType, label: ttk.Label):
+        @var.on_change
+        @root.debounce(200)
+        def _():
+            fstr = var.get()
+            error = _format_error(fstr, type)
+            if error is not None:
+                configure_changed(
+                    label, text=f"Error: {error}", style="Err.TLabel"
+                )
+                set_buttons(False)
+            else:
+                configure_changed(label, text="Looks good!", style="OK.TLabel")
+                setattr(cfg, f"replay_name_format_{type}", fstr)
+                set_buttons(True)
 
     ttk.Label(form, text="New Filename Format (1v1)", justify="right").grid(
         row=3, column=0, sticky="E", padx=2, pady=2
@@ -348,6 +561,9 @@ def create_main_ui(root: App, cfg: config.Config):
     format_error_generic = ttk.Label(form)
     format_error_generic.grid(row=6, column=1, sticky="WE", ipadx=5, ipady=5)
 
+    wire_format(state.replay_name_format_1v1, "1v1", format_error_1v1)
+    wire_format(state.replay_name_format_generic, "generic", format_error_generic)
+
     config_buttons = ttk.Frame(config_frame)
     config_buttons.pack(fill="x")
 
@@ -361,31 +577,48 @@ def create_main_ui(root: App, cfg: config.Config):
     )
     load_config.pack(side="right", fill="both", padx=3, pady=3)
 
-    renaming = False
+    renaming = Event()
+    rename_again = False
 
     def rename_replays(auto: bool = False):
-        nonlocal renaming
-        if renaming:
+        nonlocal rename_again
+        if renaming.is_set():
+            # Don't drop replays that turn up while we're busy:
+            rename_again = rename_again or auto
             return
-        renaming = True
+        renaming.set()
+        log_view = root.get_log_view()
         show_log = state.show_log_on_autorename.get() or not auto
         btn_text = "Renaming in progress"
         if show_log:
             btn_text += " - See log window"
             log_view.deiconify()
-        rename_button.config(text=btn_text, state="disabled")
+        configure_changed(rename_button, text=btn_text, state="disabled")
 
-        def callback(_):
-            rename_button.config(
+        def callback(ongoing: Optional[int]):
+            configure_changed(
+                rename_button,
                 text="Rename My Replays Now",
                 state="normal",
             )
-            nonlocal renaming
-            renaming = False
+            nonlocal rename_again
+            renaming.clear()
+            if rename_again:
+                rename_again = False
+                rename_replays(auto=True)
+            elif polling or (ongoing and state.autorename.get()):
+                # Count the polling interval from when we finish, so slow
+                # renames can't pile up. (We also need to check again for
+                # replays we skipped because their game was still going.)
+                schedule_poll()
 
-        cfg.replay_dir = Path(state.replay_dir.get())
+        cfg.replay_dir = _path(state.replay_dir.get())
         cfg.replay_name_format_1v1 = state.replay_name_format_1v1.get()
         cfg.replay_name_format_generic = state.replay_name_format_generic.get()
+        watched_dir = root.replay_watcher.replay_dir
+        if watched_dir is not None and watched_dir != cfg.replay_dir:
+            # The replay directory has been changed since we started watching it
+            watch_replay_dir()
 
         root.jobs.submit(
             rename_replays_wrapper,
@@ -429,21 +662,56 @@ def create_main_ui(root: App, cfg: config.Config):
     ).pack(side="left", padx=5, pady=5)
 
     autorename_ref = None
+    polling = False
+
+    def poll():
+        nonlocal autorename_ref
+        autorename_ref = None
+        rename_replays(auto=True)
+
+    def schedule_poll():
+        nonlocal autorename_ref
+        if autorename_ref is not None:
+            root.after_cancel(autorename_ref)
+        autorename_ref = root.after(30000, poll)
+
+    # Replays tend to arrive in bursts of filesystem events, so coalesce them:
+    @root.debounce(500)
+    def on_replay_added():
+        rename_replays(auto=True)
+
+    root.bind(REPLAY_ADDED, on_replay_added)
+
+    def watch_replay_dir():
+        """Rename new replays as soon as they appear in the replay directory."""
+        nonlocal autorename_ref, polling
+        if autorename_ref is not None:
+            root.after_cancel(autorename_ref)
+            autorename_ref = None
+        polling = False
+        try:
+            root.replay_watcher.start(_path(state.replay_dir.get()))
+        except OSError as e:
+            logger.warning(
+                f"Can't watch {state.replay_dir.get()} for new replays ({e}), "
+                "checking every 30 seconds instead."
+            )
+            polling = True
+            if not renaming.is_set():
+                # Otherwise the in-progress rename will schedule it when done
+                schedule_poll()
 
     @state.autorename.on_change
     def _(*_):
-        nonlocal autorename_ref
+        nonlocal autorename_ref, polling
+        root.replay_watcher.stop()
         if autorename_ref is not None:
             root.after_cancel(autorename_ref)
             autorename_ref = None
+        polling = False
         if state.autorename.get():
-
-            def doit():
-                nonlocal autorename_ref
-                rename_replays(auto=True)
-                autorename_ref = root.after(30000, doit)
-
-            doit()
+            rename_replays(auto=True)
+            watch_replay_dir()
 
     ttk.Checkbutton(
         gui_toggles, text="Minimize to tray on close", variable=state.minimize_to_tray
@@ -459,16 +727,16 @@ def create_main_ui(root: App, cfg: config.Config):
         side="right", padx=5, pady=5
     )
 
-    @state.replay_dir.on_change
-    def _(*_):
-        cfg.replay_dir = Path(state.replay_dir.get())
-
     @state.minimize_to_tray.on_change
     def _(*_):
         cfg.minimize_to_tray = state.minimize_to_tray.get()
 
     reload_config()
-
-    log_view = LogView(root)
-    log_view.withdraw()
-    log_view.protocol("WM_DELETE_WINDOW", log_view.clear_and_close)
+    # Variables whose loaded value matches their default (e.g. an empty replay
+    # dir) weren't changed by that, so make sure everything gets validated:
+    for var in (
+        state.replay_dir,
+        state.replay_name_format_1v1,
+        state.replay_name_format_generic,
+    ):
+        var.fire_change()
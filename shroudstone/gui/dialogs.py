@@ -0,0 +1,44 @@
+"""Dialogs that don't block the Tk main loop while waiting for an answer."""
+
+from __future__ import annotations
+
+import tkinter as tk
+from concurrent.futures import Future
+from tkinter import ttk
+
+
+class ConfirmDialog(tk.Toplevel):
+    """A modeless yes/no dialog. Unlike tkinter.messagebox.askyesno, this
+    returns immediately, so the rest of the app (e.g. autorenaming) keeps
+    running while the user decides.
+
+    The answer is delivered through the `result` future; its callbacks run in
+    the Tk thread. Closing the dialog counts as answering no."""
+
+    result: Future[bool]
+
+    def __init__(self, master: tk.Misc, title: str, message: str):
+        super().__init__(master)
+        self.result = Future()
+        self.title(title)
+        self.resizable(False, False)
+        self.transient(master.winfo_toplevel())
+        self.protocol("WM_DELETE_WINDOW", lambda: self.answer(False))
+
+        ttk.Label(self, text=message, wraplength=400, justify="left").pack(
+            fill="both", padx=10, pady=10
+        )
+        buttons = ttk.Frame(self)
+        buttons.pack(fill="x", padx=5, pady=5)
+        no = ttk.Button(buttons, text="No", command=lambda: self.answer(False))
+        no.pack(side="right", padx=3)
+        ttk.Button(buttons, text="Yes", command=lambda: self.answer(True)).pack(
+            side="right", padx=3
+        )
+        no.focus_set()
+        self.bind("<Escape>", lambda _: self.answer(False))
+
+    def answer(self, value: bool):
+        if not self.result.done():
+            self.destroy()
+            self.result.set_result(value)
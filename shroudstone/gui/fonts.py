@@ -1,8 +1,29 @@
+from functools import lru_cache
+from tkinter import ttk
 from tkinter.font import families, nametofont
 
 
+@lru_cache(maxsize=1)
+def _available_fonts() -> frozenset:
+    # families() asks Tk to enumerate every installed font, which can be slow
+    # on machines with lots of fonts - so only do it once.
+    return frozenset(families())
+
+
+MONO_FONTS = (
+    "Iosevka",
+    "DejaVu Sans Mono",
+    "Ubuntu Mono",
+    "Monaco",
+    "Consolas",
+    "Monospace",
+)
+"""Monospace fonts we'd like to use, in order of preference."""
+
+
+@lru_cache(maxsize=None)
 def first_available_font(*names) -> str:
-    fonts = families()
+    fonts = _available_fonts()
     for name in names:
         if name in fonts:
             return name
@@ -13,13 +34,11 @@ def setup_style(root):
     sans = first_available_font(
         "Ubuntu", "DejaVu Sans", "Sans", "Segoe UI", "Helvetica"
     )
-    mono = first_available_font(
-        "Iosevka",
-        "DejaVu Sans Mono",
-        "Ubuntu Mono",
-        "Monaco",
-        "Consolas",
-        "Monospace",
-    )
+    mono = first_available_font(*MONO_FONTS)
     nametofont("TkDefaultFont").configure(family=sans)
     nametofont("TkFixedFont").configure(family=mono)
+
+    # For validation messages:
+    style = ttk.Style(root)
+    style.configure("OK.TLabel", background="#66ff66")
+    style.configure("Err.TLabel", background="#ff6666")
@@ -1,11 +1,17 @@
-"""Simple framework for running asynchronous jobs in a Tk app in threads."""
+"""Simple framework for running asynchronous jobs in a Tk app in threads.
+
+Only the main thread ever calls into Tk. (Even event_generate, called from
+another thread, blocks until the main loop gets around to it, which is an easy
+way to deadlock.) Other threads hand their results over through queues, which
+the main loop polls."""
 
 from __future__ import annotations
 
 import tkinter as tk
 from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Callable, List
+from queue import Empty, SimpleQueue
+from typing import Callable, Optional
 
 from typing_extensions import Generic, ParamSpec, TypeVar
 
@@ -17,13 +23,15 @@ class TkWithJobs(tk.Tk):
         super().__init__(*args, **kwargs)
         self.jobs = JobManager(self)
 
-    def debounce(self, timeout: int = 500):
+    def debounce(
+        self, timeout: int = 500
+    ) -> Callable[[Callable[[], None]], Callable[..., None]]:
         """Use this Tk's event loop to debounce a 0-arg function.
 
         Useful for preventing on-change/on-keypress event handlers from firing too often."""
         state: dict = {"timer": None}
 
-        def decorator(func):
+        def decorator(func: Callable[[], None]) -> Callable[..., None]:
             def clear_timer_and_run(*_):
                 state["timer"] = None
                 func()
@@ -54,32 +62,45 @@ class FutureContinuation(Generic[T]):
 
 
 class JobManager:
-    """Integrates a threadpool with a Tk widget, checking the list of futures for
-    completed results every 50ms."""
+    """Integrates a threadpool with a Tk widget. Finished jobs are queued up by
+    their worker threads, and we check the queue every 50ms while there are
+    any outstanding."""
 
-    jobs: List[FutureContinuation]
+    ready: SimpleQueue[FutureContinuation]
+    outstanding: int = 0
     pool: ThreadPoolExecutor
     root: tk.Tk
-    _timer_id: str
+    _timer_id: Optional[str] = None
+    _destroyed: bool = False
 
     def __init__(self, tk):
-        self.jobs = []
-        self.pool = ThreadPoolExecutor()
+        self.ready = SimpleQueue()
+        # We only ever have a rename and the odd quick check running at once:
+        self.pool = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="shroudstone-job"
+        )
         self.root = tk
-        self.tick()
 
     def tick(self):
-        remaining: List[FutureContinuation] = []
-        ready: List[FutureContinuation] = []
-        for f in self.jobs:
-            if f.future.done():
-                ready.append(f)
-            else:
-                remaining.append(f)
-        self.jobs = remaining
-        for f in ready:
-            f.continuation(f.future.result())
-        self._timer_id = self.root.after(50, self.tick)
+        self._timer_id = None
+        while True:
+            try:
+                job = self.ready.get_nowait()
+            except Empty:
+                break
+            self.outstanding -= 1
+            try:
+                job.continuation(job.future.result())
+            except Exception as e:
+                # Report it like any other Tk callback error, but don't let
+                # it hold up the other jobs:
+                self.root.report_callback_exception(type(e), e, e.__traceback__)
+        self._schedule_tick()
+
+    def _schedule_tick(self):
+        # (The continuations above may have submitted jobs, and scheduled this.)
+        if self.outstanding and self._timer_id is None and not self._destroyed:
+            self._timer_id = self.root.after(50, self.tick)
 
     def submit(
         self,
@@ -89,9 +110,16 @@ class JobManager:
         **kwargs: P.kwargs,
     ):
         future = self.pool.submit(func, *args, **kwargs)
-        self.jobs.append(FutureContinuation(future, callback))
+        job = FutureContinuation(future, callback)
+        # (This runs in the worker thread, so mustn't touch Tk.)
+        future.add_done_callback(lambda _: self.ready.put(job))
+        self.outstanding += 1
+        self._schedule_tick()
 
     def destroy(self):
         """Call this before destroying self.tk to avoid broken reference
         errors."""
-        self.root.after_cancel(self._timer_id)
+        self._destroyed = True
+        if self._timer_id is not None:
+            self.root.after_cancel(self._timer_id)
+            self._timer_id = None
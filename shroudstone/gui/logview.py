@@ -1,10 +1,20 @@
 import logging
 import tkinter as tk
+from itertools import chain
 from queue import Empty, Queue
 from tkinter.font import Font
 from tkinter.scrolledtext import ScrolledText
+from typing import List, Tuple
 
-from .fonts import first_available_font
+from .fonts import MONO_FONTS, first_available_font
+
+MAX_RECORDS_PER_TICK = 200
+
+BUSY_POLL_INTERVAL = 50
+"""How often (in ms) to check for log records while they're arriving."""
+
+IDLE_POLL_INTERVAL = 500
+"""How often (in ms) to check for log records when nothing's been logged lately."""
 
 
 # We pipe log messages through a queue so that only the main thread touches Tk
@@ -19,28 +29,39 @@ class QueueHandler(logging.Handler):
         self.queue.put(record)
 
 
+def _log_fonts(root: tk.Misc) -> Tuple[Font, Font]:
+    """The (regular, bold) fonts for the log textbox.
+
+    These are created once per Tk root and kept referenced as an attribute of
+    it: named fonts can't be created twice, and tkinter deletes them when the
+    Font object is garbage collected."""
+    fonts = getattr(root, "_shroudstone_log_fonts", None)
+    if fonts is None:
+        mono = first_available_font(*MONO_FONTS)
+        fonts = (
+            Font(root, name="Term", family=mono, size=12),
+            Font(root, name="TermBold", family=mono, size=12, weight="bold"),
+        )
+        setattr(root, "_shroudstone_log_fonts", fonts)
+    return fonts
+
+
 class LogView(tk.Toplevel):
     textbox: ScrolledText
     queue: "Queue[logging.LogRecord]"
     handler: QueueHandler
+    _timer_id: str
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        mono = first_available_font(
-            "Iosevka",
-            "DejaVu Sans Mono",
-            "Ubuntu Mono",
-            "Monaco",
-            "Consolas",
-            "Monospace",
-        )
+    def __init__(self, master: tk.Misc, **kwargs):
+        super().__init__(master, **kwargs)
+        font, bold_font = _log_fonts(master.winfo_toplevel())
         self.title("Shroudstone Log")
         self.geometry("1024x600")
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(0, weight=1)
         self.textbox = ScrolledText(
             self,
-            font=Font(name="Term", family=mono, size=12),
+            font=font,
             background="black",
             foreground="white",
         )
@@ -49,42 +70,54 @@ class LogView(tk.Toplevel):
         self.textbox.tag_config(
             "error",
             foreground="red",
-            font=Font(name="TermBold", family=mono, size=12, weight="bold"),
+            font=bold_font,
         )
         self.textbox.tag_config("warning", foreground="orange")
         self.queue = Queue()
         self.handler = QueueHandler(self.queue)
         logging.getLogger().addHandler(self.handler)
-        self.after(0, self.tick)
+        self._timer_id = self.after(0, self.tick)
 
     def destroy(self):
         logging.getLogger().removeHandler(self.handler)
+        self.after_cancel(self._timer_id)
         return super().destroy()
 
     def tick(self):
-        self.textbox.configure(state="normal")
-        while True:
+        # Insert everything that's arrived since the last tick in one go,
+        # rather than redrawing the textbox for every record:
+        chunks: List[Tuple[str, Tuple[str, ...]]] = []
+        for _ in range(MAX_RECORDS_PER_TICK):
             try:
                 record = self.queue.get_nowait()
             except Empty:
                 break
             else:
-                self.handle_record(record)
-        self.textbox.configure(state="disabled")
-        self.after(10, self.tick)
+                chunks.append(self.format_record(record))
+        if chunks:
+            (chars, tags), *rest = chunks
+            self.textbox.configure(state="normal")
+            self.textbox.insert(tk.END, chars, tags, *chain.from_iterable(rest))
+            self.textbox.configure(state="disabled")
+        # While records are arriving (or there are more than we'll insert at
+        # once), keep checking frequently; otherwise there's no hurry.
+        interval = BUSY_POLL_INTERVAL if chunks else IDLE_POLL_INTERVAL
+        self._timer_id = self.after(interval, self.tick)
 
-    def handle_record(self, record: logging.LogRecord):
-        tags = []
+    def format_record(self, record: logging.LogRecord) -> Tuple[str, Tuple[str, ...]]:
+        """Return (chars, tags) pairs for insertion into the textbox."""
+        tags: Tuple[str, ...] = ()
         if record.levelno >= logging.WARNING:
-            tags = ["warning"]
+            tags = ("warning",)
         if record.levelno >= logging.ERROR:
-            tags = ["error"]
-        self.textbox.insert(tk.END, f"{record.msg}\n", *tags)
+            tags = ("error",)
+        text = f"{record.getMessage()}\n"
         # if record.exc_info:
         #     tb = "\n".join(traceback.format_tb(record.exc_info[2]))
-        #     self.textbox.insert(tk.END, tb, *tags)
+        #     text += tb
         if record.exc_text:
-            self.textbox.insert(tk.END, record.exc_text + "\n", *tags)
+            text += record.exc_text + "\n"
+        return (text, tags)
 
     def clear_and_close(self):
         self.textbox.configure(state="normal")
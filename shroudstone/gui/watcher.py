@@ -0,0 +1,117 @@
+"""Watch a replay directory for new replays, notifying a Tk app via a virtual event."""
+
+from __future__ import annotations
+
+import os
+import tkinter as tk
+from pathlib import Path, PureWindowsPath
+from queue import Empty, SimpleQueue
+from typing import TYPE_CHECKING, Optional
+
+from watchdog.events import FileSystemEvent, PatternMatchingEventHandler
+from watchdog.observers import Observer
+
+if TYPE_CHECKING:
+    from watchdog.observers.api import BaseObserver
+
+REPLAY_ADDED = "<<ReplayAdded>>"
+"""Virtual event generated on the watched widget when a replay file appears."""
+
+NEW_REPLAY_PATTERN = "CL*.SGReplay"
+"""Fresh replays from the game look like this; the ones we've renamed don't."""
+
+POLL_INTERVAL = 250
+"""How often (in ms) the Tk thread checks for events from the observer thread."""
+
+
+class ReplayEventHandler(PatternMatchingEventHandler):
+    events: SimpleQueue[FileSystemEvent]
+
+    def __init__(self, events: SimpleQueue[FileSystemEvent]):
+        super().__init__(
+            # (watchdog matches case-sensitive patterns against POSIX paths,
+            # which doesn't work on Windows; case-insensitive ones work anywhere.)
+            patterns=[NEW_REPLAY_PATTERN],
+            ignore_directories=True,
+            case_sensitive=False,
+        )
+        self.events = events
+
+    def on_created(self, event: FileSystemEvent):
+        self.notify(event)
+
+    def on_moved(self, event: FileSystemEvent):
+        # The pattern matches either end of a move, but when we rename a
+        # replay it's the source that matches - don't react to that.
+        if PureWindowsPath(os.fsdecode(event.dest_path)).match(NEW_REPLAY_PATTERN):
+            self.notify(event)
+
+    def notify(self, event: FileSystemEvent):
+        # We're in the observer's thread, which holds the observer's lock while
+        # we run - and the main loop needs that lock to stop the observer.
+        self.events.put(event)
+
+
+class ReplayWatcher:
+    """Watches a directory tree in a background thread, generating a
+    REPLAY_ADDED event on the given widget whenever a replay is created in
+    (or moved into) it.
+
+    (We ignore modified events: the game writes replays as the match goes on,
+    so those would keep firing throughout it.)
+
+    The observer thread just queues up filesystem events; we check the queue
+    from the Tk main loop every POLL_INTERVAL ms while watching."""
+
+    widget: tk.Misc
+    events: SimpleQueue[FileSystemEvent]
+    observer: Optional[BaseObserver] = None
+    replay_dir: Optional[Path] = None
+    _poll_id: Optional[str] = None
+
+    def __init__(self, widget: tk.Misc):
+        self.widget = widget
+        self.events = SimpleQueue()
+
+    def start(self, replay_dir: Path):
+        """Start watching replay_dir, replacing any previously watched directory.
+
+        Raises OSError if the directory can't be watched."""
+        self.stop()
+        observer = Observer()
+        observer.daemon = True
+        observer.schedule(
+            ReplayEventHandler(self.events), str(replay_dir), recursive=True
+        )
+        observer.start()
+        self.observer = observer
+        self.replay_dir = replay_dir
+        self._poll_id = self.widget.after(POLL_INTERVAL, self._poll)
+
+    def _poll(self):
+        if self._drain_events():
+            self.widget.event_generate(REPLAY_ADDED, when="tail")
+        self._poll_id = self.widget.after(POLL_INTERVAL, self._poll)
+
+    def _drain_events(self) -> bool:
+        """Empty the event queue, returning whether there was anything in it."""
+        drained = False
+        while True:
+            try:
+                self.events.get_nowait()
+            except Empty:
+                return drained
+            drained = True
+
+    def stop(self):
+        if self._poll_id is not None:
+            self.widget.after_cancel(self._poll_id)
+            self._poll_id = None
+        if self.observer is not None:
+            self.observer.stop()
+            # Don't hold up the UI if the OS is slow to let go of the directory:
+            self.observer.join(timeout=1.0)
+            self.observer = None
+            self.replay_dir = None
+        # Anything still queued was for the directory we've stopped watching:
+        self._drain_events()
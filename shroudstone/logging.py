@@ -1,8 +1,5 @@
 import logging
 
-from rich.console import Console
-from rich.logging import RichHandler
-
 _logging_configured: bool = False
 
 
@@ -10,6 +7,11 @@ def configure_logging(debug: bool = False):
     global _logging_configured
     if not _logging_configured:
         _logging_configured = True
+        # Importing rich's console machinery is comparatively slow, so only do
+        # it once we know we actually need it.
+        from rich.console import Console
+        from rich.logging import RichHandler
+
         level = logging.DEBUG if debug else logging.INFO
         console = Console(stderr=True)
         logging.captureWarnings(True)
@@ -3,23 +3,28 @@
 from __future__ import annotations
 
 from enum import Enum
+from fnmatch import fnmatch
 import logging
+import multiprocessing
 import os
-import platform
 import re
 import string
-from collections import defaultdict
+import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone, tzinfo
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
-from shutil import copytree, rmtree
-from typing import Iterable, NamedTuple, Optional, Union
+from shutil import copy2, copytree, rmtree
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
 from uuid import UUID
 
 from packaging import version
 from typing_extensions import Literal
 
 from shroudstone import __version__
-from shroudstone.config import data_dir
+from shroudstone.config import data_dir, ensure_data_dir
 from shroudstone.replay.parser import LeftGameReason
 from shroudstone.replay.summary import Player, ReplaySummary, summarize_replay
 from shroudstone.replay.versions import FRIGATE
@@ -33,6 +38,15 @@ TOLERANCE = timedelta(seconds=90)
 BAD_CHARS = re.compile(r'[<>:"/\\|?*\0]')
 """Characters forbidden in filenames on Linux or Windows"""
 
+_DELETE_BAD_CHARS = str.maketrans("", "", '<>:"/\\|?*\0')
+"""Translation table removing BAD_CHARS (str.translate is faster than re.sub)"""
+
+ORIGINAL_TIME_RE = re.compile(r"(\d\d\d\d)\.(\d\d)\.(\d\d)-(\d\d).(\d\d)")
+"""Timestamp (local time) in the game's replay filenames"""
+
+RENAMED_TIME_RE = re.compile(r"(\d\d\d\d)-(\d\d)-(\d\d) (\d\d).(\d\d)")
+"""Timestamp (UTC) in the filenames of replays we've renamed"""
+
 skipped_replays_file = data_dir / "skipped_replays.txt"
 """Directory in which previouslyskipped replays are recorded"""
 
@@ -63,6 +77,7 @@ VALID_FIELDS = {
 
 
 def migrate():
+    ensure_data_dir()
     last_run_version_file = data_dir / "last_run_version.txt"
     if last_run_version_file.exists():
         last_run_version = version.parse(
@@ -87,7 +102,9 @@ def rename_replays(
     backup: bool = True,
     reprocess: bool = False,
     files: Optional[Iterable[Path]] = None,
-):
+) -> int:
+    """Rename the replays in replay_dir, returning the number of replays that
+    were skipped because the game is still writing them."""
     migrate()
     if dry_run:
         # Don't bother
@@ -105,52 +122,50 @@ def rename_replays(
     if files is None:
         if reprocess:
             # Reprocess all replays
-            pattern = "**/*.SGReplay"
+            pattern = "*.SGReplay"
             logger.info(f"Searching for all replays in {replay_dir}.")
         else:
             # Only look for replays we haven't already renamed
-            pattern = "**/CL*.SGReplay"
+            pattern = "CL*.SGReplay"
             logger.info(f"Searching for unrenamed replays in {replay_dir}.")
 
-        files = replay_dir.glob(pattern)
+        files = find_files(replay_dir, pattern)
 
-    def try_parse(path: Path):
-        try:
-            return Replay.from_path(path)
-        except Exception:
-            logger.exception(f"Unexpected error parsing {path}")
-
-    replays = [x for x in map(try_parse, files) if x is not None]
+    replays, ongoing = parse_replays(list(files))
     if not replays:
-        logger.warning(
-            "No new replays found to rename! "
-            f"If you weren't expecting this, check your replay_dir '{replay_dir}' is correct."
-        )
-        return
+        if ongoing:
+            logger.info(
+                f"No finished replays to rename yet ({len(ongoing)} still being written)."
+            )
+        else:
+            logger.warning(
+                "No new replays found to rename! "
+                f"If you weren't expecting this, check your replay_dir '{replay_dir}' is correct."
+            )
+        return len(ongoing)
 
     n = len(replays)
     earliest_time = min(x.time for x in replays)
     logger.info(f"Found {n} unrenamed replays going back to {earliest_time}.")
-    if not skipped_replays_file.exists():
-        skipped_replays_file.touch()
-    previously_skipped_paths = {
-        Path(x)
-        for x in skipped_replays_file.read_text(encoding="utf-8").splitlines()
-        if x
-    }
+    try:
+        previously_skipped = skipped_replays_file.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        previously_skipped = ""
+    previously_skipped_paths = {Path(x) for x in previously_skipped.splitlines() if x}
     skipped_paths = []
 
-    counts = defaultdict(lambda: 0)
+    renamed = skipped_new = skipped_old = errors = 0
     for replay in replays:
         if replay.path in previously_skipped_paths:
-            counts["skipped_old"] += 1
+            skipped_old += 1
             logger.debug(
-                f"We've previously skipped {replay.path.name}, so not commenting on it this time."
+                "We've previously skipped %s, so not commenting on it this time.",
+                replay.path.name,
             )
         elif any(p.is_ai for p in replay.summary.players):
-            counts["skipped_new"] += 1
+            skipped_new += 1
             skipped_paths.append(replay.path)
-            logger.info(f"{replay.path.name} is a game vs AI, skipping it.")
+            logger.info("%s is a game vs AI, skipping it.", replay.path.name)
             continue
         else:
             try:
@@ -159,15 +174,15 @@ def rename_replays(
                 )
                 target = replay.path.parent / newname
                 do_rename(replay.path, target, dry_run=dry_run)
-                counts["renamed"] += 1
+                renamed += 1
             except Exception as e:
-                logger.error(f"Unexpected error handling {replay.path}: {e}")
-                counts["error"] += 1
+                logger.error("Unexpected error handling %s: %s", replay.path, e)
+                errors += 1
 
-    if not dry_run:
+    # (Only replays not already in the file end up in skipped_paths.)
+    if skipped_paths and not dry_run:
         with skipped_replays_file.open("at", encoding="utf-8") as f:
-            for path in skipped_paths:
-                print(path, file=f)
+            f.write("".join(f"{path}\n" for path in skipped_paths))
 
     prefix = "DRY RUN: " if dry_run else ""
     counts_str = (
@@ -176,13 +191,162 @@ def rename_replays(
         "{skipped_ongoing} skipped (ongoing), "
         "{skipped_old} ignored (previously skipped), "
         "{error} errors."
-    ).format_map(counts)
+    ).format(
+        renamed=renamed,
+        skipped_new=skipped_new,
+        skipped_ongoing=len(ongoing),
+        skipped_old=skipped_old,
+        error=errors,
+    )
     logger.info(prefix + counts_str)
+    return len(ongoing)
+
+
+def find_files(root: Path, pattern: str) -> Iterator[Path]:
+    """Find files anywhere under root whose names match the given glob pattern.
+
+    Equivalent to root.glob(f"**/{pattern}"), but faster: os.scandir tells us
+    which entries are directories without a stat call for each, and we only
+    construct Path objects for matches."""
+    stack = [str(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif fnmatch(entry.name, pattern):
+                        yield Path(entry.path)
+        except OSError as e:
+            logger.warning(f"Couldn't search {e.filename} for replays: {e}")
+
+
+PARALLEL_PARSE_THRESHOLD = 200
+"""Parse replays in a process pool when there are at least this many of them.
+(Below this, starting the worker processes costs more than it saves.)"""
+
+
+PARSE_PROGRESS_INTERVAL = 500
+"""Log progress after parsing every this many replays."""
+
+
+def parse_replays(files: List[Path]) -> Tuple[List[Replay], List[Path]]:
+    """Parse the given replay files, logging and dropping any that fail.
+
+    Returns the parsed replays, and the paths of any replays that are still
+    being written (i.e. of games in progress)."""
+    if len(files) >= PARALLEL_PARSE_THRESHOLD and (os.cpu_count() or 1) > 1:
+        # Don't fork: we may be running in a threaded GUI process, whose log
+        # handlers (and their locks) the children would inherit.
+        with ProcessPoolExecutor(
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_parse_worker,
+            initargs=(logging.getLogger().getEffectiveLevel(),),
+        ) as pool:
+            return _collect_parsed(pool.map(_try_parse, files, chunksize=16), files)
+    else:
+        return _collect_parsed(map(_try_parse, files), files)
+
+
+class _ParseResult(NamedTuple):
+    path: Path
+    replay: Optional[Replay]
+    error: Optional[str]
+    """Traceback of any unexpected error"""
+    ongoing: bool
+    """Whether the replay is incomplete because the game's still writing it"""
+    records: List[logging.LogRecord]
+    """Anything logged while parsing (in a worker process)"""
+
+
+def _collect_parsed(
+    results: Iterable[_ParseResult], files: List[Path]
+) -> Tuple[List[Replay], List[Path]]:
+    replays = []
+    ongoing = []
+    for i, result in enumerate(results, 1):
+        for record in result.records:
+            logging.getLogger(record.name).handle(record)
+        if result.error is not None:
+            logger.error("Unexpected error parsing %s:\n%s", result.path, result.error)
+        elif result.ongoing:
+            logger.info("%s is still being written, skipping it.", result.path.name)
+            ongoing.append(result.path)
+        elif result.replay is not None:
+            replays.append(result.replay)
+        if i % PARSE_PROGRESS_INTERVAL == 0:
+            logger.info(f"Parsed {i} of {len(files)} replays.")
+    return replays, ongoing
+
+
+_worker_records: Optional[List[logging.LogRecord]] = None
+"""In a parse worker process, the log records to send back to the parent."""
+
+
+class _CollectingHandler(logging.Handler):
+    def emit(self, record: logging.LogRecord):
+        assert _worker_records is not None
+        # Render the message and traceback now, so the record can be pickled
+        # whatever its args and exception were:
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        _worker_records.append(record)
+
+
+def _init_parse_worker(level: int):
+    global _worker_records
+    _worker_records = []
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(_CollectingHandler())
+
+
+def _try_parse(path: Path) -> _ParseResult:
+    # This may run in a worker process, where we can't log directly, so we
+    # pass any error (and any log records) back to the caller to log instead.
+    replay, error, ongoing = None, None, False
+    try:
+        replay = Replay.from_path(path)
+    except EOFError:
+        # The compressed stream is truncated: the game hasn't finished it yet.
+        ongoing = True
+    except Exception:
+        error = traceback.format_exc()
+    records = []
+    if _worker_records is not None:
+        records = _worker_records[:]
+        _worker_records.clear()
+    return _ParseResult(path, replay, error, ongoing, records)
 
 
 def backup_dir(replay_dir: Path, bu_dir: Path):
     logger.info(f"Backing up your replays to {bu_dir}.")
-    copytree(replay_dir, bu_dir, dirs_exist_ok=True)
+    copytree(replay_dir, bu_dir, dirs_exist_ok=True, copy_function=_link_or_copy)
+
+
+def _link_or_copy(src: str, dst: str) -> str:
+    """Hard link dst to src if possible, falling back to copying it.
+
+    Renaming replays never changes their contents, so a hard link is as good a
+    backup as a copy - and much cheaper. Since backups may thus share data with
+    replays, we never write into an existing dst: it's replaced instead."""
+    if os.path.lexists(dst):
+        if os.path.samefile(src, dst):
+            return dst  # Already backed up
+        os.unlink(dst)
+    try:
+        os.link(src, dst)
+    except OSError:
+        # e.g. filesystem doesn't support hard links
+        copy2(src, dst)
+    return dst
+
+
+def _datetime_from_match(m: re.Match) -> datetime:
+    return datetime(int(m[1]), int(m[2]), int(m[3]), int(m[4]), int(m[5]))
 
 
 def naive_localtime_to_utc(dt: datetime) -> datetime:
@@ -200,20 +364,17 @@ class Replay(NamedTuple):
     @staticmethod
     def from_path(path: Path, filename_timezone: Optional[tzinfo] = None):
         # Original names use local times:
-        if m := re.search(r"(\d\d\d\d)\.(\d\d)\.(\d\d)-(\d\d).(\d\d)", path.name):
+        if m := ORIGINAL_TIME_RE.search(path.name):
+            time = _datetime_from_match(m)
             if filename_timezone is None:
                 # Assume local time
-                time = naive_localtime_to_utc(
-                    datetime(*(int(x) for x in m.groups()))  # type: ignore
-                )
+                time = naive_localtime_to_utc(time)
             else:
-                time = datetime(
-                    *(int(x) for x in m.groups()), tzinfo=filename_timezone
-                ).astimezone(timezone.utc)
+                time = time.replace(tzinfo=filename_timezone).astimezone(timezone.utc)
 
         # Our renamed versions use UTC:
-        elif m := re.search(r"(\d\d\d\d)-(\d\d)-(\d\d) (\d\d).(\d\d)", path.name):
-            time = datetime(*(int(x) for x in m.groups()))  # type: ignore
+        elif m := RENAMED_TIME_RE.search(path.name):
+            time = _datetime_from_match(m)
         else:
             return None
 
@@ -265,6 +426,7 @@ def get_result(replay: Replay):
             return "win"
 
 
+@lru_cache(maxsize=None)
 def _cap(x: Optional[Enum]):
     if x is None:
         return ""
@@ -297,7 +459,7 @@ def new_name_for(replay: Replay, format_1v1: str, format_generic: str) -> str:
         result = get_result(replay)
         parts["result"] = (result or "unknown").capitalize()
 
-        newname = format_1v1.format(**parts)
+        newname = format_1v1.format_map(parts)
     else:
         parts["players"] = ", ".join(
             p.nickname.capitalize() for p in replay.summary.players
@@ -306,7 +468,7 @@ def new_name_for(replay: Replay, format_1v1: str, format_generic: str) -> str:
             f"{p.nickname.capitalize()} {_cap(p.faction).upper():.1}"
             for p in replay.summary.players
         )
-        newname = format_generic.format(**parts)
+        newname = format_generic.format_map(parts)
 
     # In case we left some blanks, collapse multiple spaces to one space
     newname = re.sub(r"\s+", " ", newname)
@@ -316,31 +478,37 @@ def new_name_for(replay: Replay, format_1v1: str, format_generic: str) -> str:
 
 def do_rename(source: Path, target: Path, dry_run: bool):
     if source == target:
-        logger.debug(f"{source} already has the desired format, doing nothing :)")
+        logger.debug("%s already has the desired format, doing nothing :)", source)
         return
 
     if target.exists():
-        logger.error(f"Not renaming {source}! {target} already exists!")
+        logger.error("Not renaming %s! %s already exists!", source, target)
         return
 
     if dry_run:
-        logger.info(f"DRY RUN: Would have renamed {source.name} => {target.name}.")
+        logger.info("DRY RUN: Would have renamed %s => %s.", source.name, target.name)
         return
 
-    logger.info(f"Renaming {source.name} => {target.name}.")
+    logger.info("Renaming %s => %s.", source.name, target.name)
     try:
         source.rename(target)
     except Exception as e:
-        logger.error(f"Error renaming {source} => {target.name}: {e}")
+        logger.error("Error renaming %s => %s: %s", source, target.name, e)
 
 
 def sanitize_filename(filename: str) -> str:
     """Remove bad characters from a filename"""
-    return BAD_CHARS.sub("", filename)
+    return filename.translate(_DELETE_BAD_CHARS)
 
 
+@lru_cache(maxsize=1)
 def guess_replay_dir() -> Optional[Path]:
-    if platform.system() == "Windows":
+    """Try to find the Stormgate replay directory.
+
+    The result is cached for the lifetime of the process, since on WSL this
+    can involve scanning every mounted drive; use `guess_replay_dir.cache_clear()`
+    to force a rescan."""
+    if sys.platform == "win32":
         # Should be easy, just look in the current user's local app data
         appdata = os.environ["LOCALAPPDATA"]
         paths = [Path(appdata) / "Stormgate" / "Saved" / "Replays"]
@@ -356,11 +524,13 @@ def guess_replay_dir() -> Optional[Path]:
         wslmnt = Path("/mnt")
 
         tail = "AppData/Local/Stormgate/Saved/Replays"
-        paths = [
-            *steammnt.glob(f"*/users/steamuser/{tail}"),
-            *wslmnt.glob(f"*/Users/*/{tail}"),
-            *wslmnt.glob(f"*/Documents and Settings/*/{tail}"),
-        ]
+        # Probe the usual location before falling back to scanning drives:
+        paths = chain(
+            [steammnt / "c:" / "users/steamuser" / tail],
+            steammnt.glob(f"*/users/steamuser/{tail}"),
+            wslmnt.glob(f"*/Users/*/{tail}"),
+            wslmnt.glob(f"*/Documents and Settings/*/{tail}"),
+        )
 
     for path in paths:
         if path.is_dir():
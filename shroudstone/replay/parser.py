@@ -57,6 +57,16 @@ def read_varint(f: BinaryIO) -> Optional[int]:
     return digits
 
 
+def encode_varint(n: int) -> bytes:
+    """Encode a non-negative integer as a base-7 varint, the inverse of `read_varint`."""
+    buf = bytearray()
+    while n > 0x7F:
+        buf.append((n & 0x7F) | 0x80)
+        n >>= 7
+    buf.append(n)
+    return bytes(buf)
+
+
 def split_replay(replay: Union[Path, BinaryIO]) -> Iterable[bytes]:
     """Split a replay into a sequence of chunks, each of which is a raw
     bytestring containing a wire-format encoding of a protobuf message."""
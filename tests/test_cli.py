@@ -0,0 +1,18 @@
+import re
+from typing import get_type_hints
+
+from shroudstone import cli, config
+
+
+def help_example(param: str) -> str:
+    hints = get_type_hints(cli.rename_replays, include_extras=True)
+    option = hints[param].__metadata__[0]
+    m = re.search(r"\(e\.g\. '(.*)'\)", option.help)
+    assert m is not None
+    return m[1]
+
+
+def test_help_examples_match_default_formats():
+    # These are duplicated in cli.py so --help doesn't have to import config:
+    assert help_example("format_1v1") == config.DEFAULT_1v1_FORMAT
+    assert help_example("format_generic") == config.DEFAULT_GENERIC_FORMAT
@@ -1,6 +1,7 @@
 from zoneinfo import ZoneInfo
+from shroudstone import renamer
 from shroudstone.renamer import Replay, new_name_for
-from tests.conftest import ReplayCase
+from tests.conftest import ReplayCase, data_dir
 
 f1v1 = "{time:%Y-%m-%d %H.%M} {result:.1} {duration} {us} {f1:.1}v{f2:.1} {them} - {map_name}.SGReplay"
 fgeneric = (
@@ -22,3 +23,32 @@ def test_replay_renaming(replay_case: ReplayCase, request):
         replay_case.expected_name_file.write_text(new_name, encoding="utf-8")
     else:
         assert new_name == replay_case.expected_name_file.read_text(encoding="utf-8")
+
+
+def test_parse_replays_in_process_pool(monkeypatch, tmp_path, caplog):
+    # The pool is normally only used for big batches on multi-core machines:
+    monkeypatch.setattr(renamer, "PARALLEL_PARSE_THRESHOLD", 1)
+    monkeypatch.setattr(renamer.os, "cpu_count", lambda: 2)
+    files = sorted(data_dir.glob("**/*.SGReplay"))
+    broken = tmp_path / "CL1-2024.01.01-00.00.SGReplay"
+    broken.write_bytes(b"not a replay")
+
+    replays, ongoing = renamer.parse_replays(files + [broken])
+
+    assert ongoing == []
+    assert replays == [r for r in map(Replay.from_path, files) if r is not None]
+    assert f"Unexpected error parsing {broken}" in caplog.text
+
+
+def test_parse_replays_skips_unfinished(tmp_path, caplog):
+    # The game writes replays as it goes, so we see them truncated mid-game:
+    original = next(data_dir.glob("**/CL*.SGReplay"))
+    unfinished = tmp_path / original.name
+    data = original.read_bytes()
+    unfinished.write_bytes(data[: len(data) // 2])
+
+    replays, ongoing = renamer.parse_replays([unfinished])
+
+    assert replays == []
+    assert ongoing == [unfinished]
+    assert "Unexpected error" not in caplog.text
@@ -1,5 +1,7 @@
 import json
+from io import BytesIO
 
+from shroudstone.replay.parser import encode_varint, read_varint
 from shroudstone.replay.summary import summarize_replay
 from tests.conftest import ReplayCase
 
@@ -12,3 +14,8 @@ def test_replay_renaming(replay_case: ReplayCase, request):
         with replay_case.summary_file.open("r", encoding="utf-8") as f:
             expected = json.load(f)
         assert summary == expected
+
+
+def test_varint_roundtrip():
+    for n in [0, 1, 127, 128, 300, 2**14, 2**31 - 1]:
+        assert read_varint(BytesIO(encode_varint(n))) == n
@@ -0,0 +1,34 @@
+from queue import SimpleQueue
+
+import pytest
+from watchdog.events import FileCreatedEvent, FileMovedEvent
+
+from shroudstone.gui.watcher import ReplayEventHandler
+
+replay_dirs = [
+    "/home/me/Stormgate/Replays",
+    r"C:\Users\me\AppData\Local\Stormgate\Saved\Replays",
+]
+
+
+def events_for(event) -> int:
+    queue = SimpleQueue()
+    ReplayEventHandler(queue).dispatch(event)
+    return queue.qsize()
+
+
+@pytest.mark.parametrize("replay_dir", replay_dirs)
+def test_new_replay_is_noticed(replay_dir):
+    sep = "\\" if "\\" in replay_dir else "/"
+    path = f"{replay_dir}{sep}CL75432-2024.10.05-11.38.SGReplay"
+    assert events_for(FileCreatedEvent(path)) == 1
+    assert events_for(FileMovedEvent(f"{path}.tmp", path)) == 1
+
+
+@pytest.mark.parametrize("replay_dir", replay_dirs)
+def test_our_renames_are_ignored(replay_dir):
+    sep = "\\" if "\\" in replay_dir else "/"
+    old = f"{replay_dir}{sep}CL75432-2024.10.05-11.38.SGReplay"
+    new = f"{replay_dir}{sep}2024-10-05 01.38 W 12m34s Me IvV Them - Boneyard.SGReplay"
+    assert events_for(FileMovedEvent(old, new)) == 0
+    assert events_for(FileCreatedEvent(new)) == 0